@@ -1,648 +1,801 @@
 """
 Unit Tests for HACI Quick Start Demo
 =====================================
-Tests for the core harness node functions.
+Tests for the harness phases, run in demo mode with the mock LLM provider.
 """
 
+import asyncio
+import contextlib
+import gzip
+import io
+import os
+import sqlite3
+import tempfile
 import unittest
-from typing import List
+from types import SimpleNamespace
+from unittest import mock
 
 from haci_demo import (
-    InvestigationState,
-    evaluate_node,
-    should_continue,
-    act_node,
-    think_node,
+    CachedTool,
+    DatadogLogsTool,
+    GitHubDeploymentsTool,
+    HACIHarness,
+    HarnessState,
+    LLMClient,
+    PagerDutyTool,
+    PrometheusMetricsTool,
+    Tool,
     CONFIDENCE_THRESHOLDS,
+    LARGE_RESPONSE_CHARS,
+    MOCK_DATA,
+    action_gate,
+    main,
+    run_batch,
+    _collapse_logs,
+    _timeframe_seconds,
 )
 
+try:
+    import web_demo
+except ImportError:  # fastapi/uvicorn are only needed for the web demo
+    web_demo = None
 
-class TestEvaluateNode(unittest.TestCase):
-    """Tests for the evaluate_node function."""
-
-    def test_confidence_calculation_with_three_findings(self):
-        """Test that evaluate_node correctly calculates 94% confidence with 3+ findings."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1", "Finding 2", "Finding 3"],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 2,
-            "max_iterations": 5,
-        }
-        
-        result = evaluate_node(state)
-        
-        self.assertEqual(result["confidence"], 94.0)
-        self.assertIn("Root Cause", result["resolution"])
-        self.assertEqual(result["iteration"], 3)
-
-    def test_confidence_calculation_with_two_findings(self):
-        """Test that evaluate_node correctly calculates 75% confidence with 2 findings."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1", "Finding 2"],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 1,
-            "max_iterations": 5,
-        }
-        
-        result = evaluate_node(state)
-        
-        self.assertEqual(result["confidence"], 75.0)
-        self.assertIn("Partial", result["resolution"])
-        self.assertEqual(result["iteration"], 2)
-
-    def test_confidence_calculation_with_one_finding(self):
-        """Test that evaluate_node correctly calculates 40% confidence with 1 finding."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1"],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 0,
-            "max_iterations": 5,
-        }
-        
-        result = evaluate_node(state)
-        
-        self.assertEqual(result["confidence"], 40.0)
-        self.assertIn("Insufficient evidence", result["resolution"])
-        self.assertEqual(result["iteration"], 1)
-
-    def test_confidence_calculation_with_no_findings(self):
-        """Test that evaluate_node correctly calculates 40% confidence with no findings."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 0,
-            "max_iterations": 5,
-        }
-        
-        result = evaluate_node(state)
-        
-        self.assertEqual(result["confidence"], 40.0)
-        self.assertIn("Insufficient evidence", result["resolution"])
-
-    def test_action_determination_auto_execute(self):
-        """Test that evaluate_node determines AUTO-EXECUTE action at 95%+ confidence."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1", "Finding 2", "Finding 3"],  # Will give 94% confidence
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 2,
-            "max_iterations": 5,
-        }
-        
-        result = evaluate_node(state)
-        
-        # 94% is below auto_execute threshold (95%), but close
-        self.assertGreaterEqual(result["confidence"], CONFIDENCE_THRESHOLDS["execute_review"])
-        
-        # Let's test the boundary by verifying threshold logic
-        confidence = result["confidence"]
-        if confidence >= CONFIDENCE_THRESHOLDS["auto_execute"]:
-            expected_action = "AUTO-EXECUTE"
-        elif confidence >= CONFIDENCE_THRESHOLDS["execute_review"]:
-            expected_action = "EXECUTE WITH REVIEW"
-        elif confidence >= CONFIDENCE_THRESHOLDS["require_approval"]:
-            expected_action = "REQUIRE APPROVAL"
-        else:
-            expected_action = "CONTINUE INVESTIGATION"
-        
-        # With 94% confidence, should be "EXECUTE WITH REVIEW"
-        self.assertEqual(expected_action, "EXECUTE WITH REVIEW")
-
-    def test_action_determination_execute_review(self):
-        """Test that action is EXECUTE WITH REVIEW for confidence between 85-94%."""
-        # We know from the code that 2 findings gives 75%, so we'll verify that threshold
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1", "Finding 2"],  # Gives 75% confidence
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 1,
-            "max_iterations": 5,
-        }
-        
-        result = evaluate_node(state)
-        confidence = result["confidence"]
-        
-        # Determine action based on thresholds
-        if confidence >= CONFIDENCE_THRESHOLDS["auto_execute"]:
-            action = "AUTO-EXECUTE"
-        elif confidence >= CONFIDENCE_THRESHOLDS["execute_review"]:
-            action = "EXECUTE WITH REVIEW"
-        elif confidence >= CONFIDENCE_THRESHOLDS["require_approval"]:
-            action = "REQUIRE APPROVAL"
-        else:
-            action = "CONTINUE INVESTIGATION"
-        
-        # With 75% confidence and threshold at 70%, should be "REQUIRE APPROVAL"
-        self.assertEqual(action, "REQUIRE APPROVAL")
-
-    def test_action_determination_require_approval(self):
-        """Test that action is REQUIRE APPROVAL for confidence between 70-84%."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1", "Finding 2"],  # Gives 75% confidence
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 1,
-            "max_iterations": 5,
-        }
-        
-        result = evaluate_node(state)
-        
-        self.assertEqual(result["confidence"], 75.0)
-        self.assertGreaterEqual(result["confidence"], CONFIDENCE_THRESHOLDS["require_approval"])
-        self.assertLess(result["confidence"], CONFIDENCE_THRESHOLDS["execute_review"])
-
-    def test_action_determination_continue_investigation(self):
-        """Test that action is CONTINUE INVESTIGATION for confidence below 70%."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1"],  # Gives 40% confidence
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 0,
-            "max_iterations": 5,
-        }
-        
-        result = evaluate_node(state)
-        
-        self.assertEqual(result["confidence"], 40.0)
-        self.assertLess(result["confidence"], CONFIDENCE_THRESHOLDS["require_approval"])
-
-    def test_evaluate_node_increments_iteration(self):
-        """Test that evaluate_node increments the iteration counter."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1"],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 0,
-            "max_iterations": 5,
-        }
-        
-        result = evaluate_node(state)
-        
-        self.assertEqual(result["iteration"], 1)
-
-
-class TestShouldContinue(unittest.TestCase):
-    """Tests for the should_continue function."""
-
-    def test_continues_with_low_confidence_and_iterations_remaining(self):
-        """Test that investigation continues with low confidence and iterations remaining."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 40.0,  # Below require_approval threshold (70%)
-            "resolution": "",
-            "iteration": 1,
-            "max_iterations": 5,
-        }
-        
-        result = should_continue(state)
-        
-        self.assertEqual(result, "think")
-
-    def test_ends_with_high_confidence(self):
-        """Test that investigation ends when confidence reaches approval threshold."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1", "Finding 2"],
-            "tool_outputs": [],
-            "confidence": 75.0,  # Above require_approval threshold (70%)
-            "resolution": "",
-            "iteration": 1,
-            "max_iterations": 5,
-        }
-        
-        result = should_continue(state)
-        
-        self.assertEqual(result, "end")
-
-    def test_ends_when_max_iterations_reached(self):
-        """Test that investigation ends when max iterations are reached."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 40.0,  # Low confidence
-            "resolution": "",
-            "iteration": 5,  # At max
-            "max_iterations": 5,
-        }
-        
-        result = should_continue(state)
-        
-        self.assertEqual(result, "end")
-
-    def test_continues_just_below_confidence_threshold(self):
-        """Test that investigation continues when confidence is just below threshold."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 69.9,  # Just below require_approval threshold (70%)
-            "resolution": "",
-            "iteration": 2,
-            "max_iterations": 5,
-        }
-        
-        result = should_continue(state)
-        
-        self.assertEqual(result, "think")
-
-    def test_ends_at_exact_confidence_threshold(self):
-        """Test that investigation ends at exact confidence threshold."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 70.0,  # Exactly at require_approval threshold
-            "resolution": "",
-            "iteration": 2,
-            "max_iterations": 5,
-        }
-        
-        result = should_continue(state)
-        
-        self.assertEqual(result, "end")
-
-    def test_ends_when_max_iterations_exceeded(self):
-        """Test that investigation ends when iterations exceed max."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 40.0,
-            "resolution": "",
-            "iteration": 6,  # Over max
-            "max_iterations": 5,
-        }
-        
-        result = should_continue(state)
-        
-        self.assertEqual(result, "end")
-
-
-class TestActNode(unittest.TestCase):
-    """Tests for the act_node function."""
-
-    def test_iteration_zero_queries_datadog(self):
-        """Test that act_node queries Datadog on iteration 0."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 0,
-            "max_iterations": 5,
-        }
-        
-        result = act_node(state)
-        
-        self.assertEqual(len(result["tool_outputs"]), 1)
-        self.assertIn("Datadog:", result["tool_outputs"][0])
-        self.assertIn("ACT (iter 0): Executed tools", result["messages"][-1])
-
-    def test_iteration_one_queries_github(self):
-        """Test that act_node queries GitHub on iteration 1."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 1,
-            "max_iterations": 5,
-        }
-        
-        result = act_node(state)
-        
-        self.assertEqual(len(result["tool_outputs"]), 1)
-        self.assertIn("GitHub:", result["tool_outputs"][0])
-        self.assertIn("ACT (iter 1): Executed tools", result["messages"][-1])
-
-    def test_iteration_two_checks_metrics(self):
-        """Test that act_node checks metrics on iteration 2+."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 2,
-            "max_iterations": 5,
-        }
-        
-        result = act_node(state)
-        
-        self.assertEqual(len(result["tool_outputs"]), 1)
-        self.assertIn("Metrics:", result["tool_outputs"][0])
-        self.assertIn("ACT (iter 2): Executed tools", result["messages"][-1])
-
-    def test_tool_outputs_accumulate_across_iterations(self):
-        """Test that tool_outputs accumulate across multiple act_node calls."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": ["Previous output"],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 0,
-            "max_iterations": 5,
-        }
-        
-        result = act_node(state)
-        
-        # tool_outputs should accumulate (annotated with operator.add)
-        self.assertEqual(len(result["tool_outputs"]), 2)
-        self.assertEqual(result["tool_outputs"][0], "Previous output")
-        self.assertIn("Datadog:", result["tool_outputs"][1])
-
-    def test_higher_iteration_checks_metrics(self):
-        """Test that iterations beyond 2 also check metrics."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 3,
-            "max_iterations": 5,
-        }
-        
-        result = act_node(state)
-        
-        self.assertEqual(len(result["tool_outputs"]), 1)
-        self.assertIn("Metrics:", result["tool_outputs"][0])
-
-
-class TestThinkNode(unittest.TestCase):
-    """Tests for the think_node function."""
-
-    def test_iteration_zero_generates_initial_hypotheses(self):
-        """Test that think_node generates 3 initial hypotheses on iteration 0."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 0,
-            "max_iterations": 5,
-        }
-        
-        result = think_node(state)
-        
-        self.assertEqual(len(result["hypotheses"]), 3)
-        self.assertIn("deployment", result["hypotheses"][0])
-        self.assertIn("database", result["hypotheses"][1])
-        self.assertIn("resource", result["hypotheses"][2])
-        self.assertIn("THINK (iter 0): Formed hypotheses", result["messages"][-1])
-
-    def test_iteration_one_generates_refined_hypothesis(self):
-        """Test that think_node generates 1 refined hypothesis on iteration 1."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Some finding"],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 1,
-            "max_iterations": 5,
-        }
-        
-        result = think_node(state)
-        
-        self.assertEqual(len(result["hypotheses"]), 1)
-        self.assertIn("Correlating", result["hypotheses"][0])
-        self.assertIn("THINK (iter 1): Formed hypotheses", result["messages"][-1])
-
-    def test_iteration_two_generates_validation_hypothesis(self):
-        """Test that think_node generates validation hypothesis on iteration 2+."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1", "Finding 2"],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 2,
-            "max_iterations": 5,
-        }
-        
-        result = think_node(state)
-        
-        self.assertEqual(len(result["hypotheses"]), 1)
-        self.assertIn("Validating", result["hypotheses"][0])
-        self.assertIn("THINK (iter 2): Formed hypotheses", result["messages"][-1])
-
-    def test_higher_iteration_generates_validation_hypothesis(self):
-        """Test that iterations beyond 2 generate validation hypotheses."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 4,
-            "max_iterations": 5,
-        }
-        
-        result = think_node(state)
-        
-        self.assertEqual(len(result["hypotheses"]), 1)
-        self.assertIn("Validating", result["hypotheses"][0])
-
-    def test_hypotheses_content_matches_iteration(self):
-        """Test that hypothesis content appropriately matches the investigation stage."""
-        # Iteration 0: broad hypotheses
-        state_0: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 0,
-            "max_iterations": 5,
-        }
-        result_0 = think_node(state_0)
-        self.assertGreater(len(result_0["hypotheses"]), 1)
-        
-        # Iteration 1: more specific
-        state_1: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1"],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 1,
-            "max_iterations": 5,
-        }
-        result_1 = think_node(state_1)
-        self.assertEqual(len(result_1["hypotheses"]), 1)
-        
-        # Iteration 2: convergence
-        state_2: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1", "Finding 2"],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 2,
-            "max_iterations": 5,
-        }
-        result_2 = think_node(state_2)
-        self.assertEqual(len(result_2["hypotheses"]), 1)
-
-
-class TestIntegrationScenarios(unittest.TestCase):
+
+# Blank every key LLMClient looks for, so harnesses built here use the mock provider
+_NO_PROVIDER_ENV = {
+    "ANTHROPIC_API_KEY": "",
+    "OPENAI_API_KEY": "",
+    "LANGCHAIN_TRACING_V2": "",
+    "HACI_DB_PATH": "",
+}
+
+
+def _make_harness() -> HACIHarness:
+    """Build a quiet harness on the mock provider."""
+    with mock.patch.dict(os.environ, _NO_PROVIDER_ENV):
+        harness = HACIHarness(verbose=False)
+    assert harness.llm.provider == "mock"
+    return harness
+
+
+def _make_state(**overrides) -> HarnessState:
+    """Build a test state for the default ticket."""
+    return HarnessState(ticket="Test ticket", **overrides)
+
+
+class TestLLMClient(unittest.TestCase):
+    """Tests for LLMClient's shared SDK clients."""
+
+    def _make_client(self) -> LLMClient:
+        """Build an Anthropic-backed client around a stand-in SDK class."""
+        sdk = SimpleNamespace(AsyncAnthropic=lambda: object())
+        env = {**_NO_PROVIDER_ENV, "ANTHROPIC_API_KEY": "test-key"}
+        with mock.patch.dict(os.environ, env), mock.patch.dict("sys.modules", {"anthropic": sdk}):
+            client = LLMClient()
+        self.assertEqual(client.provider, "anthropic")
+        return client
+
+    def test_sdk_client_shared_within_a_loop(self):
+        """Test that clients on one event loop share a single SDK client."""
+        first, second = self._make_client(), self._make_client()
+        
+        async def both():
+            return first.client, second.client, first.client
+        
+        a, b, c = asyncio.run(both())
+        self.assertIs(a, b)
+        self.assertIs(a, c)
+
+    def test_sdk_client_per_event_loop(self):
+        """Test that a new event loop gets its own SDK client, not one bound to a closed loop."""
+        llm = self._make_client()
+        
+        async def current():
+            return llm.client
+        
+        first = asyncio.run(current())
+        second = asyncio.run(current())
+        self.assertIsNot(first, second)
+
+    def test_assigned_client_overrides_sdk(self):
+        """Test that assigning client replaces the shared SDK client."""
+        llm = self._make_client()
+        stand_in = object()
+        
+        llm.client = stand_in
+        
+        self.assertIs(llm.client, stand_in)
+
+
+class TestEvaluate(unittest.IsolatedAsyncioTestCase):
+    """Tests for HACIHarness.evaluate and the verdict it records."""
+
+    # (confidence in the verdict, expected state status)
+    CONFIDENCE_CASES = [
+        (96, "auto_executing"),
+        (94, "executing_with_review"),
+        (75, "awaiting_approval"),
+        (40, "investigating"),
+    ]
+
+    def setUp(self):
+        self.harness = _make_harness()
+
+    async def test_mock_verdict(self):
+        """Test that evaluate records the mock provider's 94% verdict."""
+        state = _make_state(findings=[{"finding": "Pool exhausted", "severity": "critical", "confidence": 96}])
+        
+        result = await self.harness.evaluate(state)
+        
+        self.assertIs(result, state)
+        self.assertEqual(result.confidence, 94)
+        self.assertEqual(result.status, "executing_with_review")
+        self.assertIn("Connection pool misconfiguration", result.root_cause)
+        self.assertIn("kubectl rollout undo", result.resolution["command"])
+        self.assertEqual(result.llm_calls[-1]["phase"], "EVALUATE")
+
+    async def test_evaluate_increments_iteration(self):
+        """Test that evaluate increments the iteration counter."""
+        state = _make_state()
+        
+        result = await self.harness.evaluate(state)
+        
+        self.assertEqual(result.iteration, 1)
+
+    async def test_streamed_confidence_split_across_chunks(self):
+        """Test that the early confidence is spotted when the field arrives a character at a time."""
+        reply = '{"root_cause_identified": true, "root_cause": "Pool shrunk", "confidence": 91, "resolution": null}'
+        
+        async def one_char_at_a_time(*args, **kwargs):
+            for char in reply:
+                yield char
+        
+        self.harness.verbose = True
+        output = io.StringIO()
+        with mock.patch.object(self.harness.llm, "generate_stream", one_char_at_a_time), contextlib.redirect_stdout(output):
+            result = await self.harness.evaluate(_make_state())
+        
+        self.assertIn("Confidence received: 91%", output.getvalue())
+        self.assertEqual(result.confidence, 91)
+        self.assertEqual(result.root_cause, "Pool shrunk")
+
+    def test_confidence_sets_status(self):
+        """Test that a verdict's confidence maps to the matching action status."""
+        for confidence, expected_status in self.CONFIDENCE_CASES:
+            with self.subTest(confidence=confidence):
+                state = _make_state()
+                
+                self.harness._apply_evaluation(state, {"confidence": confidence})
+                
+                self.assertEqual(state.confidence, confidence)
+                self.assertEqual(state.status, expected_status)
+
+    def test_missing_confidence_defaults_low(self):
+        """Test that a verdict without a confidence keeps investigating."""
+        state = _make_state()
+        
+        self.harness._apply_evaluation(state, {"reasoning": "unsure"})
+        
+        self.assertEqual(state.confidence, 30)
+        self.assertEqual(state.status, "investigating")
+
+
+class TestActionGate(unittest.TestCase):
+    """Tests for action_gate's threshold lookup."""
+
+    # (confidence, expected status); each threshold is inclusive
+    BOUNDARY_CASES = [
+        (100, "auto_executing"),
+        (95, "auto_executing"),
+        (94.99, "executing_with_review"),
+        (85, "executing_with_review"),
+        (84.99, "awaiting_approval"),
+        (70, "awaiting_approval"),
+        (69.99, "investigating"),
+        (0, "investigating"),
+        (-5, "investigating"),
+    ]
+
+    def test_threshold_boundaries(self):
+        """Test that each threshold belongs to the gate it opens."""
+        for confidence, expected_status in self.BOUNDARY_CASES:
+            with self.subTest(confidence=confidence):
+                self.assertEqual(action_gate(confidence).status, expected_status)
+
+    def test_gates_follow_configured_thresholds(self):
+        """Test that each gate opens exactly at its CONFIDENCE_THRESHOLDS value."""
+        for name, threshold in CONFIDENCE_THRESHOLDS.items():
+            with self.subTest(threshold=name):
+                self.assertEqual(action_gate(threshold).threshold, threshold)
+                self.assertLess(action_gate(threshold - 0.01).threshold, threshold)
+
+
+class TestParseJson(unittest.IsolatedAsyncioTestCase):
+    """Tests for HACIHarness._parse_json."""
+
+    async def test_plain_object(self):
+        """Test that a bare JSON object is parsed."""
+        self.assertEqual(await HACIHarness._parse_json('{"confidence": 94}'), {"confidence": 94})
+
+    async def test_object_wrapped_in_prose_and_fence(self):
+        """Test that the object is found inside a chatty, code-fenced reply."""
+        text = 'Here is my verdict:\n```json\n{"confidence": 80, "resolution": {"command": "x"}}\n```\nThanks!'
+        
+        result = await HACIHarness._parse_json(text)
+        
+        self.assertEqual(result, {"confidence": 80, "resolution": {"command": "x"}})
+
+    async def test_replies_without_an_object(self):
+        """Test that replies with no complete object give None."""
+        for text in ("", "No JSON here", "[1, 2, 3]", "} backwards {"):
+            with self.subTest(text=text):
+                self.assertIsNone(await HACIHarness._parse_json(text))
+
+    async def test_invalid_json(self):
+        """Test that a malformed object gives None instead of raising."""
+        self.assertIsNone(await HACIHarness._parse_json('{"confidence": 94,}'))
+
+    async def test_large_reply(self):
+        """Test that replies over LARGE_RESPONSE_CHARS parse the same way."""
+        reasoning = "x" * (LARGE_RESPONSE_CHARS + 1)
+        
+        result = await HACIHarness._parse_json(f'Verdict: {{"confidence": 90, "reasoning": "{reasoning}"}}')
+        
+        self.assertEqual(result["confidence"], 90)
+        self.assertEqual(len(result["reasoning"]), LARGE_RESPONSE_CHARS + 1)
+
+
+class TestCollapseLogs(unittest.TestCase):
+    """Tests for _collapse_logs."""
+
+    def test_repeated_lines_are_merged(self):
+        """Test that identical log lines become one entry with a count and time span."""
+        result = _collapse_logs(MOCK_DATA["datadog_logs"])
+        
+        users_502 = [
+            entry for entry in result["results"]
+            if entry.get("path") == "/api/users" and "502" in entry["message"]
+        ]
+        self.assertEqual(len(users_502), 1)
+        self.assertEqual(users_502[0]["count"], 2)
+        self.assertEqual(users_502[0]["first_ts"], "2024-01-15T14:21:15Z")
+        self.assertEqual(users_502[0]["last_ts"], "2024-01-15T14:21:18Z")
+        self.assertNotIn("timestamp", users_502[0])
+
+    def test_distinct_lines_are_kept(self):
+        """Test that lines differing in path or message stay separate and untouched."""
+        result = _collapse_logs(MOCK_DATA["datadog_logs"])
+        
+        self.assertEqual(len(result["results"]), len(MOCK_DATA["datadog_logs"]["results"]) - 1)
+        self.assertIn(MOCK_DATA["datadog_logs"]["results"][0], result["results"])
+        self.assertEqual(result["summary"], MOCK_DATA["datadog_logs"]["summary"])
+
+
+class TestLogTimeframe(unittest.IsolatedAsyncioTestCase):
+    """Tests for Datadog timeframe parsing and filtering."""
+
+    def test_timeframe_seconds(self):
+        """Test that timeframes convert to seconds and bad ones give None."""
+        cases = [("90s", 90), ("15m", 900), ("1h", 3600), ("2D", 172800), ("", None), ("h", None), ("1w", None), ("-5m", None)]
+        for timeframe, expected in cases:
+            with self.subTest(timeframe=timeframe):
+                self.assertEqual(_timeframe_seconds(timeframe), expected)
+
+    async def test_window_is_relative_to_newest_entry(self):
+        """Test that a short window keeps only entries near the newest one."""
+        result = await DatadogLogsTool().execute(query="*", timeframe="1m")
+        
+        self.assertEqual([e["timestamp"] for e in result["results"]], ["2024-01-15T14:22:30Z", "2024-01-15T14:23:00Z"])
+
+    async def test_narrowed_window_recounts_summary(self):
+        """Test that a short window's summary describes only the entries it kept."""
+        tool = DatadogLogsTool()
+        result = await tool.execute(query="*", timeframe="1m")
+        
+        self.assertEqual(result["summary"], {
+            "total_errors": 2,
+            "first_error": "2024-01-15T14:22:30Z",
+            "services_affected": ["user-service", "api-gateway"],
+        })
+        self.assertEqual(tool.summarize(result), "Found 2 log entries | 2 errors | Error rate: N/A")
+        self.assertEqual(MOCK_DATA["datadog_logs"]["summary"]["total_errors"], 47)
+
+    async def test_wide_or_unparsable_window_returns_everything(self):
+        """Test that windows covering all entries, or unparsable ones, return the data unchanged."""
+        for timeframe in ("1h", "bogus"):
+            with self.subTest(timeframe=timeframe):
+                result = await DatadogLogsTool().execute(query="*", timeframe=timeframe)
+                
+                self.assertIs(result, MOCK_DATA["datadog_logs"])
+
+
+class TestToolSummaries(unittest.TestCase):
+    """Tests for each tool's one-line result summary."""
+
+    def test_datadog_summary(self):
+        """Test the log summary with and without the aggregate block."""
+        tool = DatadogLogsTool()
+        cases = [
+            (MOCK_DATA["datadog_logs"], "Found 8 log entries | 47 errors | Error rate: 23.5%"),
+            ({"results": [{}, {}]}, "Found 2 log entries"),
+            ({}, "Found 0 log entries"),
+        ]
+        for result, expected in cases:
+            with self.subTest(result=result):
+                self.assertEqual(tool.summarize(result), expected)
+
+    def test_github_summary(self):
+        """Test the deployment summary with files, without files, and with no deployments."""
+        tool = GitHubDeploymentsTool()
+        cases = [
+            (
+                MOCK_DATA["github_deployments"],
+                "Found deployment abc123 at 2024-01-15T14:20:00Z | Changed: config/database.yaml, config/timeouts.yaml",
+            ),
+            ({"recent": [{"id": "def456", "timestamp": "2024-01-15T15:00:00Z"}]}, "Found deployment def456 at 2024-01-15T15:00:00Z"),
+            ({"recent": []}, "Found deployment N/A at N/A"),
+        ]
+        for result, expected in cases:
+            with self.subTest(result=result):
+                self.assertEqual(tool.summarize(result), expected)
+
+    def test_prometheus_summary(self):
+        """Test the metrics summary, defaulting each missing gauge to 0."""
+        tool = PrometheusMetricsTool()
+        
+        self.assertEqual(tool.summarize(MOCK_DATA["prometheus_metrics"]), "CPU: 45.2% | Mem: 78.5% | Connections: 98/100")
+        self.assertEqual(tool.summarize({}), "CPU: 0% | Mem: 0% | Connections: 0/0")
+
+    def test_pagerduty_summary(self):
+        """Test the incident count summary."""
+        tool = PagerDutyTool()
+        
+        self.assertEqual(tool.summarize(MOCK_DATA["pagerduty_incidents"]), "Found 1 active incident(s)")
+        self.assertEqual(tool.summarize({}), "Found 0 active incident(s)")
+
+    def test_base_summary(self):
+        """Test that a tool without its own summary reports the result's size."""
+        self.assertEqual(Tool().summarize({"a": 1, "b": 2}), "Retrieved 2 data points")
+        self.assertEqual(Tool().summarize({}), "Retrieved 0 data points")
+
+
+class _CountingTool(Tool):
+    """Tool that counts its calls, can be held mid-call, and can be made to fail."""
+    name = "counting_tool"
+    description = "Counts calls"
+    
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+        self.fail = False
+    
+    async def execute(self, **params):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("integration down")
+        return {"call": self.calls, **params}
+
+
+class TestCachedTool(unittest.IsolatedAsyncioTestCase):
+    """Tests for CachedTool's result cache."""
+
+    def setUp(self):
+        self.tool = _CountingTool()
+        self.cached = CachedTool(self.tool)
+
+    async def test_repeat_call_reuses_result(self):
+        """Test that an identical call is served from the cache."""
+        first = await self.cached.execute(service="api")
+        second = await self.cached.execute(service="api")
+        
+        self.assertIs(first, second)
+        self.assertEqual(self.tool.calls, 1)
+        self.assertEqual((self.cached.hits, self.cached.misses), (1, 1))
+
+    async def test_different_params_are_separate_entries(self):
+        """Test that calls with other parameters run the tool again."""
+        await self.cached.execute(service="api")
+        await self.cached.execute(service="database")
+        
+        self.assertEqual(self.tool.calls, 2)
+
+    async def test_concurrent_callers_share_in_flight_call(self):
+        """Test that a caller arriving mid-call joins it instead of re-issuing."""
+        self.tool.release.clear()
+        first = asyncio.ensure_future(self.cached.execute(service="api"))
+        second = asyncio.ensure_future(self.cached.execute(service="api"))
+        await asyncio.sleep(0)
+        self.tool.release.set()
+        
+        results = await asyncio.gather(first, second)
+        
+        self.assertEqual(self.tool.calls, 1)
+        self.assertIs(results[0], results[1])
+
+    async def test_caller_timeout_leaves_call_running_for_others(self):
+        """Test that one caller timing out doesn't cancel the shared call."""
+        self.tool.release.clear()
+        waiting = asyncio.ensure_future(self.cached.execute(service="api"))
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.cached.execute(service="api"), 0.01)
+        self.tool.release.set()
+        
+        self.assertEqual((await waiting)["call"], 1)
+        self.assertEqual(self.tool.calls, 1)
+
+    async def test_failed_call_is_not_cached(self):
+        """Test that a failure is evicted so the next call retries."""
+        self.tool.fail = True
+        with self.assertRaises(RuntimeError):
+            await self.cached.execute(service="api")
+        self.tool.fail = False
+        
+        result = await self.cached.execute(service="api")
+        
+        self.assertEqual(result["call"], 2)
+        self.assertEqual(self.cached.misses, 2)
+
+    async def test_expired_entry_is_replaced(self):
+        """Test that a result older than the TTL is fetched again."""
+        await self.cached.execute(service="api")
+        
+        with mock.patch("haci_demo.time.monotonic", return_value=1e12):
+            result = await self.cached.execute(service="api")
+        
+        self.assertEqual(result["call"], 2)
+        self.assertEqual(len(self.cached._results), 1)
+
+    async def test_cache_is_bounded(self):
+        """Test that the least recently used entries are dropped past CACHE_SIZE."""
+        size = CachedTool.CACHE_SIZE
+        for i in range(size):
+            await self.cached.execute(n=i)
+        await self.cached.execute(n=0)  # refresh the oldest entry
+        await self.cached.execute(n=size)
+        
+        self.assertEqual(len(self.cached._results), size)
+        await self.cached.execute(n=0)
+        self.assertEqual(self.tool.calls, size + 1)
+        await self.cached.execute(n=1)
+        self.assertEqual(self.tool.calls, size + 2)
+
+    async def test_claiming_a_prefetch_counts_as_miss(self):
+        """Test that a prefetch isn't counted and the lookup it served is a miss."""
+        self.cached.prefetch(service="api")
+        self.assertEqual((self.cached.hits, self.cached.misses), (0, 0))
+        
+        await self.cached.execute(service="api")
+        await self.cached.execute(service="api")
+        
+        self.assertEqual(self.tool.calls, 1)
+        self.assertEqual((self.cached.hits, self.cached.misses), (1, 1))
+
+    async def test_discarded_prefetch_is_cancelled(self):
+        """Test that an unclaimed prefetch is cancelled and dropped."""
+        self.tool.release.clear()
+        self.cached.prefetch(service="api")
+        task = self.cached._results[CachedTool._key({"service": "api"})].task
+        await asyncio.sleep(0)
+        
+        self.cached.discard_prefetch(service="api")
+        await asyncio.sleep(0)
+        
+        self.assertTrue(task.cancelled())
+        self.assertEqual(len(self.cached._results), 0)
+
+    async def test_claimed_prefetch_is_not_discarded(self):
+        """Test that discarding leaves a call that a lookup already claimed."""
+        self.cached.prefetch(service="api")
+        await self.cached.execute(service="api")
+        
+        self.cached.discard_prefetch(service="api")
+        
+        self.assertEqual(len(self.cached._results), 1)
+
+    async def test_forgotten_call_runs_again(self):
+        """Test that a forgotten call is not served from the cache."""
+        await self.cached.execute(service="api")
+        
+        self.cached.forget(service="api")
+        await self.cached.execute(service="api")
+        
+        self.assertEqual(self.tool.calls, 2)
+        self.assertEqual(self.cached.hits, 0)
+
+
+class TestThink(unittest.IsolatedAsyncioTestCase):
+    """Tests for HACIHarness.think."""
+
+    def setUp(self):
+        self.harness = _make_harness()
+
+    async def test_generates_mock_hypotheses(self):
+        """Test that think records the three mock hypotheses."""
+        state = _make_state()
+        
+        result = await self.harness.think(state)
+        
+        self.assertEqual(len(result.hypotheses), 3)
+        self.assertIn("deployment", result.hypotheses[0]["hypothesis"])
+        self.assertEqual(result.llm_calls[-1]["phase"], "THINK")
+
+    async def test_low_confidence_hypotheses_need_evidence(self):
+        """Test that think leaves ACT and OBSERVE in the loop below auto-execute confidence."""
+        state = _make_state()
+        
+        result = await self.harness.think(state)
+        
+        self.assertFalse(result.skip_to_evaluate)
+
+    async def test_hypotheses_accumulate_across_iterations(self):
+        """Test that each THINK adds to the hypotheses already on the state."""
+        state = _make_state()
+        
+        await self.harness.think(state)
+        state.iteration = 1
+        await self.harness.think(state)
+        
+        self.assertEqual(len(state.hypotheses), 6)
+
+    async def test_malformed_hypotheses_are_coerced_or_dropped(self):
+        """Test that string confidences are read and non-object entries skipped."""
+        reply = '{"hypotheses": [{"hypothesis": "Pool shrunk", "confidence": "97%"}, "junk", {"confidence": "n/a"}]}'
+        
+        with mock.patch.object(self.harness.llm, "generate", mock.AsyncMock(return_value=reply)):
+            result = await self.harness.think(_make_state())
+        
+        self.assertEqual([h["confidence"] for h in result.hypotheses], [97, 50])
+        self.assertTrue(result.skip_to_evaluate)
+
+    async def test_root_cause_identified_skips_evidence(self):
+        """Test that THINK reporting the root cause as identified skips ACT and OBSERVE."""
+        reply = '{"hypotheses": [{"hypothesis": "Pool shrunk", "confidence": 80}], "root_cause_identified": true}'
+        
+        with mock.patch.object(self.harness.llm, "generate", mock.AsyncMock(return_value=reply)):
+            result = await self.harness.think(_make_state())
+        
+        self.assertTrue(result.skip_to_evaluate)
+
+
+class TestAct(unittest.IsolatedAsyncioTestCase):
+    """Tests for HACIHarness.act."""
+
+    def setUp(self):
+        self.harness = _make_harness()
+
+    async def test_iteration_zero_queries_logs_and_incidents(self):
+        """Test that act queries Datadog and PagerDuty on iteration 0."""
+        state = _make_state()
+        
+        result = await self.harness.act(state)
+        
+        self.assertEqual([r.tool for r in result.tool_results], ["datadog_logs_search", "pagerduty_incidents"])
+        self.assertIn("47 errors", result.tool_results[0].summary)
+
+    async def test_iteration_one_queries_deployments_and_metrics(self):
+        """Test that act queries GitHub and Prometheus on iteration 1."""
+        state = _make_state(iteration=1)
+        
+        result = await self.harness.act(state)
+        
+        self.assertEqual([r.tool for r in result.tool_results], ["github_deployments", "prometheus_metrics"])
+        self.assertIn("abc123", result.tool_results[0].summary)
+
+    async def test_later_iterations_check_database_metrics(self):
+        """Test that act checks database metrics from iteration 2 on."""
+        for iteration in (2, 3):
+            with self.subTest(iteration=iteration):
+                state = _make_state(iteration=iteration)
+                
+                result = await self.harness.act(state)
+                
+                self.assertEqual(len(result.tool_results), 1)
+                self.assertEqual(result.tool_results[0].params, {"service": "database"})
+
+    async def test_tool_results_accumulate_across_iterations(self):
+        """Test that tool results accumulate and carry their iteration."""
+        state = _make_state()
+        
+        await self.harness.act(state)
+        state.iteration = 1
+        await self.harness.act(state)
+        
+        self.assertEqual(len(state.tool_results), 4)
+        self.assertEqual([r.iteration for r in state.tool_results], [0, 0, 1, 1])
+
+
+@unittest.skipIf(web_demo is None, "web demo dependencies not installed")
+class TestStaticAsset(unittest.TestCase):
+    """Tests for the web demo's pre-encoded responses."""
+
+    def setUp(self):
+        self.asset = web_demo.StaticAsset(b"body { color: red; }" * 10, "text/css", "no-cache")
+
+    def _respond(self, **headers):
+        return self.asset.response(SimpleNamespace(headers=headers))
+
+    def test_encoding_negotiation(self):
+        """Test that gzip is served only when accepted with a non-zero q-value."""
+        cases = [
+            ("", False),
+            ("gzip", True),
+            ("GZip, deflate", True),
+            ("br;q=1.0, gzip;q=0.5", True),
+            ("gzip;q=0", False),
+            ("gzip; q=0.0, *", False),
+            ("*", True),
+            ("*;q=0", False),
+            ("deflate, br", False),
+        ]
+        for accept_encoding, expect_gzip in cases:
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self._respond(**{"accept-encoding": accept_encoding})
+                
+                self.assertIs(response, self.asset.gzipped if expect_gzip else self.asset.plain)
+
+    def test_gzipped_body(self):
+        """Test that the gzipped copy decodes to the original body."""
+        self.assertEqual(gzip.decompress(self.asset.gzipped.body), self.asset.body)
+
+    def test_codings_have_distinct_etags(self):
+        """Test that the identity and gzip bodies carry different strong validators."""
+        self.assertNotEqual(self.asset.etag, self.asset.gzip_etag)
+        self.assertEqual(self.asset.plain.headers["etag"], self.asset.etag)
+        self.assertEqual(self.asset.gzipped.headers["etag"], self.asset.gzip_etag)
+
+    def test_revalidation(self):
+        """Test that If-None-Match gets a 304 only for the representation it names."""
+        asset = self.asset
+        cases = [
+            ({"if-none-match": asset.etag}, asset.not_modified),
+            ({"if-none-match": f'"other", W/{asset.etag}'}, asset.not_modified),
+            ({"if-none-match": asset.gzip_etag, "accept-encoding": "gzip"}, asset.gzip_not_modified),
+            ({"if-none-match": asset.gzip_etag}, asset.plain),
+            ({"if-none-match": asset.etag, "accept-encoding": "gzip"}, asset.gzipped),
+            ({"if-none-match": "*"}, asset.not_modified),
+            ({"if-none-match": '"stale"'}, asset.plain),
+        ]
+        for headers, expected in cases:
+            with self.subTest(headers=headers):
+                self.assertIs(self._respond(**headers), expected)
+
+
+class TestBatchInput(unittest.IsolatedAsyncioTestCase):
+    """Tests for --batch reading its tickets from stdin."""
+
+    async def test_rejects_anything_but_a_list_of_strings(self):
+        """Test that bad stdin exits with usage instead of running investigations."""
+        for stdin in ('"abc"', "", "[1, 2]", '{"ticket": "abc"}', "not json"):
+            with self.subTest(stdin=stdin):
+                with mock.patch("sys.argv", ["haci_demo.py", "--batch"]), \
+                        mock.patch("sys.stdin", io.StringIO(stdin)), \
+                        mock.patch("haci_demo.run_batch") as batch:
+                    with self.assertRaises(SystemExit) as raised:
+                        await main()
+                
+                self.assertIn("usage:", str(raised.exception.code))
+                batch.assert_not_called()
+
+
+class TestIntegrationScenarios(unittest.IsolatedAsyncioTestCase):
     """Integration tests for complete investigation scenarios."""
 
-    def test_full_investigation_cycle(self):
-        """Test a complete investigation cycle through all nodes."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": [],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 0,
-            "max_iterations": 5,
-        }
-        
-        # Iteration 0: THINK -> ACT -> OBSERVE -> EVALUATE
-        state = think_node(state)
-        self.assertEqual(len(state["hypotheses"]), 3)
-        
-        state = act_node(state)
-        self.assertGreater(len(state["tool_outputs"]), 0)
-        
-        # Simulate observe_node (add a finding)
-        state["findings"].append("Finding 1")
-        
-        state = evaluate_node(state)
-        self.assertEqual(state["confidence"], 40.0)
-        self.assertEqual(state["iteration"], 1)
-        
-        # Should continue
-        decision = should_continue(state)
-        self.assertEqual(decision, "think")
-
-    def test_early_termination_high_confidence(self):
-        """Test that investigation terminates early with high confidence."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1", "Finding 2", "Finding 3"],
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 2,
-            "max_iterations": 5,
-        }
-        
-        state = evaluate_node(state)
-        self.assertEqual(state["confidence"], 94.0)
-        
-        decision = should_continue(state)
-        self.assertEqual(decision, "end")
-
-    def test_max_iterations_reached(self):
-        """Test that investigation stops when max iterations reached."""
-        state: InvestigationState = {
-            "ticket": "Test ticket",
-            "messages": [],
-            "hypotheses": [],
-            "findings": ["Finding 1"],  # Low confidence
-            "tool_outputs": [],
-            "confidence": 0.0,
-            "resolution": "",
-            "iteration": 4,
-            "max_iterations": 5,
-        }
-        
-        state = evaluate_node(state)
-        self.assertEqual(state["iteration"], 5)
-        
-        decision = should_continue(state)
-        self.assertEqual(decision, "end")
+    def setUp(self):
+        self.harness = _make_harness()
+
+    async def test_full_investigation_cycle(self):
+        """Test one THINK -> ACT -> OBSERVE -> EVALUATE pass ending at execute-with-review."""
+        state = await self.harness.run("Test ticket")
+        
+        self.assertEqual(state.iteration, 1)
+        self.assertEqual(state.confidence, 94)
+        self.assertEqual(state.status, "executing_with_review")
+        self.assertEqual([call["phase"] for call in state.llm_calls], ["THINK", "OBSERVE", "EVALUATE"])
+        self.assertEqual(len(state.tool_results), 2)
+        self.assertEqual(len(state.findings), 4)
+
+    async def test_prefetched_tools_are_not_cache_hits(self):
+        """Test that ACT claiming the calls prefetched during THINK isn't reported as reuse."""
+        await self.harness.run("Test ticket")
+        
+        tools = self.harness.tools.values()
+        self.assertEqual(sum(tool.hits for tool in tools), 0)
+        self.assertEqual(sum(tool.misses for tool in tools), 2)
+
+    async def test_settled_think_skips_act_and_observe(self):
+        """Test that run goes straight to EVALUATE and drops the prefetched tools when THINK settles it."""
+        reply = '{"hypotheses": [{"hypothesis": "Pool shrunk", "confidence": 97}]}'
+        
+        with mock.patch.object(self.harness.llm, "generate", mock.AsyncMock(return_value=reply)):
+            state = await self.harness.run("Test ticket")
+        
+        self.assertEqual([call["phase"] for call in state.llm_calls], ["THINK", "EVALUATE"])
+        self.assertEqual(state.tool_results, [])
+        self.assertTrue(all(not tool._results for tool in self.harness.tools.values()))
+
+    async def test_batch_records_calls_in_one_store(self):
+        """Test that a batch shares one call store and closes it when done."""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "calls.db")
+            with mock.patch.dict(os.environ, {**_NO_PROVIDER_ENV, "HACI_DB_PATH": db_path}):
+                states = await run_batch(["Ticket A", "Ticket B"])
+            
+            self.assertEqual([state.confidence for state in states], [94, 94])
+            with contextlib.closing(sqlite3.connect(db_path)) as conn:
+                rows = conn.execute("SELECT ticket, COUNT(*) FROM llm_calls GROUP BY ticket ORDER BY ticket").fetchall()
+            self.assertEqual(rows, [("Ticket A", 3), ("Ticket B", 3)])
+
+    async def test_batch_run_forgetting_a_call_spares_a_run_waiting_on_it(self):
+        """Test that a fused fallback forgetting a shared call doesn't fail another ticket's ACT."""
+        held = _CountingTool()
+        held.release.clear()
+        tool = self.harness.tools["datadog_logs_search"] = CachedTool(held)
+        params = self.harness._planned_tools(0)[0][2]
+        pending = []
+        
+        async def fused(system, prompt, tools, run_tool):
+            if "Ticket A" not in prompt:
+                return None
+            pending.append(asyncio.ensure_future(run_tool("datadog_logs_search", params)))
+            # Wait until Ticket B's ACT shares the call, then give up so it is forgotten
+            while tool.hits == 0:
+                await asyncio.sleep(0)
+            asyncio.get_running_loop().call_soon(held.release.set)
+            return None
+        
+        # Two runs on one harness, as run_batch does
+        with mock.patch.object(LLMClient, "supports_tool_use", new_callable=mock.PropertyMock, return_value=True), \
+                mock.patch.object(self.harness.llm, "generate_with_tools", fused):
+            first, second = await asyncio.gather(
+                self.harness.run("Ticket A", fused=True),
+                self.harness.run("Ticket B", fused=True),
+            )
+            await asyncio.gather(*pending)
+        
+        self.assertEqual(second.status, "executing_with_review")
+        self.assertEqual([result.tool for result in second.tool_results], ["datadog_logs_search", "pagerduty_incidents"])
+        self.assertEqual(first.status, "executing_with_review")
+
+    async def test_stops_at_approval_threshold(self):
+        """Test that the loop ends as soon as confidence reaches the approval threshold."""
+        state = await self.harness.run("Test ticket")
+        
+        self.assertGreaterEqual(state.confidence, CONFIDENCE_THRESHOLDS["require_approval"])
+        self.assertLess(state.iteration, state.max_iterations)
+
+    async def test_combined_mode_makes_one_call_per_iteration(self):
+        """Test that combined mode folds the three reasoning phases into one call."""
+        state = await self.harness.run("Test ticket", combined=True)
+        
+        self.assertEqual([call["phase"] for call in state.llm_calls], ["REASON"])
+        self.assertEqual(state.confidence, 94)
+
+    async def test_fused_mode_without_tool_use_says_it_falls_back(self):
+        """Test that fused mode on the mock provider reports the phased loop is running instead."""
+        self.harness.verbose = True
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            state = await self.harness.run("Test ticket", fused=True)
+        
+        self.assertIn("Fused mode needs the Anthropic SDK", out.getvalue())
+        self.assertEqual([call["phase"] for call in state.llm_calls], ["THINK", "OBSERVE", "EVALUATE"])
+        self.assertEqual(state.confidence, 94)
+
+    async def test_fused_turn_limit_leaves_phased_loop_a_clean_state(self):
+        """Test that a fused conversation that never settles leaves no results or cache entries behind."""
+        async def never_settles(system, prompt, tools, run_tool):
+            await run_tool("datadog_logs_search", {"query": "service:api-gateway status:error", "timeframe": "1h"})
+            return None
+        
+        with mock.patch.object(LLMClient, "supports_tool_use", new_callable=mock.PropertyMock, return_value=True), \
+                mock.patch.object(self.harness.llm, "generate_with_tools", never_settles):
+            state = await self.harness.run("Test ticket", fused=True)
+        
+        self.assertEqual([call["phase"] for call in state.llm_calls], ["THINK", "OBSERVE", "EVALUATE"])
+        self.assertEqual(len(state.tool_results), 2)
+        self.assertEqual(sum(tool.hits for tool in self.harness.tools.values()), 0)
 
 
 if __name__ == "__main__":